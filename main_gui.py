@@ -4,86 +4,157 @@ A PyQt6-based GUI for capturing screenshots from multiple VISA instruments.
 """
 import sys
 import os
-from datetime import datetime
-from typing import List, Optional
-from dataclasses import dataclass, field
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from dataclasses import dataclass
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QCheckBox, QLineEdit, QScrollArea,
-    QFrame, QSizePolicy, QTextEdit, QSpacerItem
+    QFrame, QPlainTextEdit
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt6.QtGui import QFont, QIcon, QPixmap
+from PyQt6.QtCore import Qt, QThread, QThreadPool, QRunnable, QSemaphore, pyqtSignal, QTimer
+from PyQt6.QtGui import QColor, QTextCharFormat, QTextCursor
 
-import pyvisa
-from pyvisa.errors import VisaIOError
-
-# Import functions from oscilloscope_control
+# oscilloscope_control imports pyvisa only on first use, so importing it here
+# does not slow down the window start-up
 from oscilloscope_control import (
-    open_scope, capture_screenshot_display, read_binblock,
-    AUTOSCALE_DEFAULT_ENABLED, AUTOSCALE_WAIT_SECONDS, TIMEBASE_SECONDS_PER_DIVISION
+    TIMEBASE_SECONDS_PER_DIVISION, VENDOR_COMMANDS,
+    cached_session, capture_screenshot_display, close_rm, close_sessions,
+    get_oscilloscope_vendor, get_rm, get_session, list_resources, visa_open_lock
 )
 
+if TYPE_CHECKING:
+    import pyvisa
+
+# strftime format for screenshot filenames
+_TS_FILE = "%Y%m%d_%H%M%S"
+
+# Characters replaced when a device name is used in a screenshot filename,
+# including everything Windows does not allow in a file name
+_SAFE_NAME_TABLE = str.maketrans({" ": "_", **dict.fromkeys('/\\:*?"<>|', "-")})
+
+# Connection type for worker -> GUI signals
+_QUEUED = Qt.ConnectionType.QueuedConnection
+
+# VISA interface prefix -> device type shown in the device list
+_RES_RE = re.compile(r"(USB|GPIB|TCPIP|ASRL)")
+_TYPE_MAP = {"USB": "USB", "GPIB": "GPIB", "TCPIP": "TCP/IP", "ASRL": "Serial"}
+
+# *IDN? manufacturer prefix -> vendor key in VENDOR_COMMANDS
+_IDN_VENDORS = tuple((prefix, vendor) for vendor, commands in VENDOR_COMMANDS.items()
+                     for prefix in commands["idn_manufacturers"])
+
 
-@dataclass
+@dataclass(slots=True)
 class Device:
-    """Represents a VISA device."""
+    """Represents a VISA device. Identity (eq/hash) is the VISA resource id."""
     id: str
     name: str
     device_type: str
     connected: bool = True
     enabled: bool = False
+    vendor: str = "unknown"  # key in VENDOR_COMMANDS; picks the screenshot commands and format
+
+    def __eq__(self, other):
+        return isinstance(other, Device) and self.id == other.id
+
+    def __hash__(self):
+        return hash(self.id)
 
 
 class ScanThread(QThread):
     """Thread for scanning VISA devices without blocking the UI."""
-    devices_found = pyqtSignal(list)
+    devices_found = pyqtSignal(list, float)  # devices, scan seconds
     error_occurred = pyqtSignal(str)
 
     def run(self):
+        started = time.perf_counter()
         try:
-            rm = pyvisa.ResourceManager()
-            resources = rm.list_resources()
-            devices = []
-            for resource in resources:
-                # Parse resource name to get device info
-                device_type = "Unknown"
-                name = resource
-                if "USB" in resource:
-                    device_type = "USB"
-                    # Try to get IDN
-                    try:
-                        inst = rm.open_resource(resource)
-                        inst.timeout = 2000
-                        idn = inst.query("*IDN?").strip()
-                        inst.close()
-                        name = idn.split(",")[1] if "," in idn else idn[:30]
-                    except:
-                        name = resource.split("::")[3] if len(resource.split("::")) > 3 else resource
-                elif "GPIB" in resource:
-                    device_type = "GPIB"
-                elif "TCPIP" in resource:
-                    device_type = "TCP/IP"
-                elif "ASRL" in resource:
-                    device_type = "Serial"
-                
-                devices.append(Device(
-                    id=resource,
-                    name=name,
-                    device_type=device_type,
-                    connected=True,
-                    enabled=False
-                ))
-            self.devices_found.emit(devices)
+            rm = get_rm()
+            # A scan is an explicit refresh, so always re-enumerate
+            resources = list_resources(refresh=True)
+            # Only USB instruments are asked for *IDN?; query them all at once.
+            # Each probe is bounded by its own VISA timeout and returns None when the
+            # instrument does not answer, so a slow device never fails the whole scan.
+            usb_resources = [r for r in resources if r.startswith("USB")]
+            idns = {}
+            if usb_resources:
+                probe = partial(self._query_idn, rm)
+                with ThreadPoolExecutor(max_workers=min(8, len(usb_resources))) as executor:
+                    idns = dict(zip(usb_resources, executor.map(probe, usb_resources)))
+            devices = [self._make_device(resource, idns.get(resource)) for resource in resources]
+            self.devices_found.emit(devices, time.perf_counter() - started)
         except Exception as e:
             self.error_occurred.emit(str(e))
 
+    @staticmethod
+    def _query_idn(rm: "pyvisa.ResourceManager", resource: str) -> Optional[str]:
+        """Return the *IDN? reply of a resource, or None if it does not answer."""
+        # An instrument with a capture session is asked through that session; some
+        # backends (pyvisa-py/libusb) cannot open the same USB interface twice
+        session = cached_session(resource)
+        if session is not None:
+            try:
+                with session.connection() as scope:
+                    return scope.query("*IDN?").strip()
+            except Exception:
+                return None
+        inst = None
+        try:
+            # On pyvisa-py opens are serialised with the capture threads; the query itself is not
+            with visa_open_lock(rm):
+                inst = rm.open_resource(resource)
+            inst.timeout = 2000
+            return inst.query("*IDN?").strip()
+        except Exception:
+            return None
+        finally:
+            if inst is not None:
+                inst.close()
+
+    @staticmethod
+    def _make_device(resource: str, idn: Optional[str]) -> Device:
+        """Build a Device from a resource name and its IDN (None if not queried or silent)."""
+        # Parse resource name to get device info (VISA names start with the interface)
+        match = _RES_RE.match(resource)
+        device_type = _TYPE_MAP[match.group(1)] if match else "Unknown"
+        name = resource
+        connected = True
+        # The USB vendor ID is exact; the IDN only fills in for other interfaces
+        vendor = get_oscilloscope_vendor(resource)
+        if vendor == "unknown" and idn is not None:
+            manufacturer = idn.upper()
+            for prefix, idn_vendor in _IDN_VENDORS:
+                if manufacturer.startswith(prefix):
+                    vendor = idn_vendor
+                    break
+        if device_type == "USB":
+            if idn is not None:
+                name = idn.split(",")[1] if "," in idn else idn[:30]
+            else:
+                # Keep unresponsive devices in the list, just mark them offline
+                connected = False
+                parts = resource.split("::")
+                name = parts[3] if len(parts) > 3 else resource
+
+        return Device(
+            id=resource,
+            name=name,
+            device_type=device_type,
+            connected=connected,
+            enabled=False,
+            vendor=vendor
+        )
+
 
 class CaptureThread(QThread):
     """Thread for capturing screenshots without blocking the UI."""
     capture_started = pyqtSignal(str)
-    capture_completed = pyqtSignal(str, str)  # device_id, filepath
+    capture_completed = pyqtSignal(str, str, float)  # device_id, filepath, seconds
     capture_failed = pyqtSignal(str, str)  # device_id, error
     all_completed = pyqtSignal()
 
@@ -94,56 +165,83 @@ class CaptureThread(QThread):
         self.folder = folder
         self.mode = mode  # 0=As Is, 1=AutoScale, 2=Custom
         self.timebase = timebase
+        # Filenames are built here, on the GUI thread, so the workers only do I/O.
+        # The whole batch shares one timestamp; the index keeps two scopes of the
+        # same model from writing to the same file. The extension comes from the
+        # device's session, which also picks the screenshot command.
+        batch_ts = time.strftime(_TS_FILE)
+        self.jobs: List[Tuple[str, str, str]] = [
+            (d.id,
+             os.path.join(folder, f"scope_{d.name.translate(_SAFE_NAME_TABLE)[:20]}_{batch_ts}_{i:02d}."
+                                  f"{get_session(d.id, d.vendor).image_format}"),
+             d.vendor)
+            for i, d in enumerate(d for d in devices if d.enabled)
+        ]
 
     def run(self):
-        for device in self.devices:
-            if not device.enabled:
-                continue
-            self.capture_started.emit(device.id)
-            try:
-                # Generate unique filename
-                timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
-                safe_name = device.name.replace(" ", "_").replace("/", "-")[:20]
-                filename = f"scope_{safe_name}_{timestamp_str}.png"
-                filepath = os.path.join(self.folder, filename)
-                
-                # Capture screenshot based on mode
-                if self.mode == 0:
-                    # As It Is - capture without any changes
-                    self._capture_as_is(device.id, filepath)
-                elif self.mode == 1:
-                    # AutoScale mode
-                    capture_screenshot_display(
-                        resource_name=device.id,
-                        folder=self.folder,
-                        autoscale=True,
-                        timebase_scale=None
-                    )
-                else:
-                    # Custom Time Base mode
-                    capture_screenshot_display(
-                        resource_name=device.id,
-                        folder=self.folder,
-                        autoscale=False,
-                        timebase_scale=self.timebase
-                    )
-                self.capture_completed.emit(device.id, filepath)
-            except Exception as e:
-                self.capture_failed.emit(device.id, str(e))
+        # One pool task per device so the scopes are really triggered together
+        pool = QThreadPool()
+        pool.setMaxThreadCount(max(1, min(len(self.jobs), 8)))
+        done = QSemaphore(0)
+        for job in self.jobs:
+            self.capture_started.emit(job[0])
+            pool.start(CaptureTask(self, job, done))
+        # Every task releases once in its finally block
+        done.acquire(len(self.jobs))
         self.all_completed.emit()
 
-    def _capture_as_is(self, resource_name: str, filepath: str):
-        """Capture screenshot without changing any oscilloscope settings."""
-        scope = open_scope(resource_name)
+    def _capture_one(self, device_id: str, filepath: str, vendor: str):
+        """Capture a single device and report the result (runs in a worker thread)."""
+        started = time.perf_counter()
         try:
-            # Just capture, no AutoScale, no TimeBase changes
-            scope.write(':DISPlay:DATA? PNG, COLOR')
-            image_data = read_binblock(scope)
-            
-            with open(filepath, 'wb') as f:
-                f.write(image_data)
+            # Capture screenshot based on mode
+            if self.mode == 0:
+                # As It Is - no AutoScale, no TimeBase changes, just the screenshot
+                capture_screenshot_display(
+                    resource_name=device_id,
+                    folder=self.folder,
+                    filepath=filepath,
+                    configure_display=False,
+                    vendor=vendor
+                )
+            elif self.mode == 1:
+                # AutoScale mode
+                capture_screenshot_display(
+                    resource_name=device_id,
+                    folder=self.folder,
+                    autoscale=True,
+                    timebase_scale=None,
+                    filepath=filepath,
+                    vendor=vendor
+                )
+            else:
+                # Custom Time Base mode
+                capture_screenshot_display(
+                    resource_name=device_id,
+                    folder=self.folder,
+                    autoscale=False,
+                    timebase_scale=self.timebase,
+                    filepath=filepath,
+                    vendor=vendor
+                )
+            self.capture_completed.emit(device_id, filepath, time.perf_counter() - started)
+        except Exception as e:
+            self.capture_failed.emit(device_id, str(e))
+
+
+class CaptureTask(QRunnable):
+    """Pool task capturing one device; results go out through the CaptureThread signals."""
+    def __init__(self, owner: CaptureThread, job: Tuple[str, str, str], done: QSemaphore):
+        super().__init__()
+        self.owner = owner
+        self.job = job  # (device_id, filepath, vendor)
+        self.done = done
+
+    def run(self):
+        try:
+            self.owner._capture_one(*self.job)
         finally:
-            scope.close()
+            self.done.release()
 
 
 class DeviceWidget(QFrame):
@@ -178,20 +276,20 @@ class DeviceWidget(QFrame):
 
         # Monitor icon placeholder (using text emoji for simplicity)
         icon_label = QLabel("🖥")
-        icon_label.setStyleSheet("font-size: 14px;")
+        icon_label.setObjectName("deviceIcon")
         layout.addWidget(icon_label)
 
         # Device info
         info_layout = QVBoxLayout()
         info_layout.setSpacing(2)
         
-        name_label = QLabel(self.device.name)
-        name_label.setObjectName("deviceName")
-        info_layout.addWidget(name_label)
+        self.name_label = QLabel(self.device.name)
+        self.name_label.setObjectName("deviceName")
+        info_layout.addWidget(self.name_label)
         
-        details_label = QLabel(f"{self.device.device_type} • {self.device.id}")
-        details_label.setObjectName("deviceDetails")
-        info_layout.addWidget(details_label)
+        self.details_label = QLabel(f"{self.device.device_type} • {self.device.id}")
+        self.details_label.setObjectName("deviceDetails")
+        info_layout.addWidget(self.details_label)
         
         layout.addLayout(info_layout, 1)
 
@@ -203,12 +301,27 @@ class DeviceWidget(QFrame):
         self.toggled.emit(self.device.id, self.device.enabled)
 
     def update_style(self):
-        if self.device.enabled:
-            self.setProperty("selected", True)
-        else:
-            self.setProperty("selected", False)
-        self.style().unpolish(self)
-        self.style().polish(self)
+        # Re-polish only this frame, and only when the selection really changed
+        if self.property("selected") != self.device.enabled:
+            self.setProperty("selected", self.device.enabled)
+            self.style().polish(self)
+
+    def refresh_labels(self):
+        """Re-read name, details and connection state from self.device."""
+        self.name_label.setText(self.device.name)
+        self.details_label.setText(f"{self.device.device_type} • {self.device.id}")
+        if self.status_indicator.property("connected") != self.device.connected:
+            self.status_indicator.setProperty("connected", self.device.connected)
+            self.status_indicator.style().polish(self.status_indicator)
+
+    def bind(self, device: Device):
+        """Point a pooled widget at another device without rebuilding it."""
+        self.device = device
+        self.checkbox.blockSignals(True)
+        self.checkbox.setChecked(device.enabled)
+        self.checkbox.blockSignals(False)
+        self.update_style()
+        self.refresh_labels()
 
     def mousePressEvent(self, event):
         self.checkbox.setChecked(not self.checkbox.isChecked())
@@ -216,12 +329,24 @@ class DeviceWidget(QFrame):
 
 class DevicePanel(QFrame):
     """Panel showing detected VISA devices."""
+    device_toggled = pyqtSignal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.devices: List[Device] = []
-        self.device_widgets: List[DeviceWidget] = []
+        self._by_id: Dict[str, DeviceWidget] = {}
+        self._widget_pool: List[DeviceWidget] = []
+        self._enabled_count = 0
         self.setup_ui()
 
+    @property
+    def device_widgets(self) -> List[DeviceWidget]:
+        return list(self._by_id.values())
+
+    @property
+    def enabled_count(self) -> int:
+        return self._enabled_count
+
     def setup_ui(self):
         self.setObjectName("panel")
         layout = QVBoxLayout(self)
@@ -278,30 +403,57 @@ class DevicePanel(QFrame):
         layout.addWidget(scroll_area)
 
     def set_devices(self, devices: List[Device]):
-        # Clear existing widgets
-        for widget in self.device_widgets:
+        incoming = {device.id: device for device in devices}
+        # Apply all row changes first and repaint the list once at the end
+        self.device_container.setUpdatesEnabled(False)
+
+        # Park widgets of devices that are gone so later scans can reuse them
+        for device_id in set(self._by_id) - set(incoming):
+            widget = self._by_id.pop(device_id)
             self.device_layout.removeWidget(widget)
-            widget.deleteLater()
-        self.device_widgets.clear()
-        self.devices = devices
+            widget.hide()
+            self._widget_pool.append(widget)
+
+        # Update known devices in place (keeps their enabled state), add new ones
+        new_widgets: List[DeviceWidget] = []
+        for device_id, device in incoming.items():
+            widget = self._by_id.get(device_id)
+            if widget is not None:
+                widget.device.name = device.name
+                widget.device.device_type = device.device_type
+                widget.device.connected = device.connected
+                widget.device.vendor = device.vendor
+                widget.refresh_labels()
+            else:
+                if self._widget_pool:
+                    widget = self._widget_pool.pop()
+                    widget.bind(device)
+                else:
+                    widget = DeviceWidget(device)
+                    widget.toggled.connect(self._on_device_toggled)
+                self._by_id[device_id] = widget
+                new_widgets.append(widget)
+        if new_widgets:
+            # Take the trailing stretch out once, append the rows, then put it back
+            stretch = self.device_layout.takeAt(self.device_layout.count() - 1)
+            for widget in new_widgets:
+                self.device_layout.addWidget(widget)
+                widget.show()
+            self.device_layout.addItem(stretch)
+        self.devices = [self._by_id[device_id].device for device_id in incoming]
+        self._enabled_count = sum(1 for d in self.devices if d.enabled)
 
         self.empty_label.setVisible(len(devices) == 0)
-
-        for device in devices:
-            widget = DeviceWidget(device)
-            widget.toggled.connect(self._on_device_toggled)
-            self.device_widgets.append(widget)
-            self.device_layout.insertWidget(self.device_layout.count() - 1, widget)
-
+        self.device_container.setUpdatesEnabled(True)
         self.update_count()
 
     def _on_device_toggled(self, device_id: str, enabled: bool):
+        self._enabled_count += 1 if enabled else -1
         self.update_count()
+        self.device_toggled.emit()
 
     def update_count(self):
-        enabled_count = sum(1 for d in self.devices if d.enabled)
-        total_count = len(self.devices)
-        self.count_label.setText(f"({enabled_count}/{total_count} active)")
+        self.count_label.setText(f"({self._enabled_count}/{len(self.devices)} active)")
 
     def get_enabled_devices(self) -> List[Device]:
         return [d for d in self.devices if d.enabled]
@@ -365,6 +517,7 @@ class ControlPanel(QFrame):
 
         self.capture_status = QLabel("Enable at least one device")
         self.capture_status.setObjectName("captureStatus")
+        self.capture_status.setProperty("active", False)
         self.capture_status.setAlignment(Qt.AlignmentFlag.AlignCenter)
         btn_layout.addWidget(self.capture_status)
 
@@ -467,37 +620,34 @@ class ControlPanel(QFrame):
         """Handle mode change: 0=As Is, 1=AutoScale, 2=Custom"""
         self.current_mode = mode
         
-        # Update button states
-        self.mode_btn_asis.setProperty("active", mode == 0)
-        self.mode_btn_auto.setProperty("active", mode == 1)
-        self.mode_btn_custom.setProperty("active", mode == 2)
-        
-        # Refresh button styles
-        for btn in [self.mode_btn_asis, self.mode_btn_auto, self.mode_btn_custom]:
-            btn.style().unpolish(btn)
-            btn.style().polish(btn)
+        # Update button states, re-polishing only the buttons whose state flipped
+        for index, btn in enumerate((self.mode_btn_asis, self.mode_btn_auto, self.mode_btn_custom)):
+            if btn.property("active") != (index == mode):
+                btn.setProperty("active", index == mode)
+                btn.style().polish(btn)
         
         # Show/hide timebase input - only visible for Custom mode
         self.timebase_container.setVisible(mode == 2)
 
     def update_capture_button(self, enabled_count: int, is_capturing: bool):
+        active = False
         if is_capturing:
             self.capture_btn.setText("⏳ Capturing...")
             self.capture_btn.setEnabled(False)
             self.capture_status.setText("Please wait...")
-            self.capture_status.setObjectName("captureStatus")
         elif enabled_count == 0:
             self.capture_btn.setEnabled(False)
             self.capture_status.setText("Enable at least one device")
-            self.capture_status.setObjectName("captureStatus")
         else:
             self.capture_btn.setText("⚡ Take a Shot")
             self.capture_btn.setEnabled(True)
             device_word = "device" if enabled_count == 1 else "devices"
             self.capture_status.setText(f"{enabled_count} {device_word} will be triggered simultaneously")
-            self.capture_status.setObjectName("captureStatusActive")
-        self.capture_status.style().unpolish(self.capture_status)
-        self.capture_status.style().polish(self.capture_status)
+            active = True
+        # Restyle via the [active="true"] selector, only when the state flips
+        if self.capture_status.property("active") != active:
+            self.capture_status.setProperty("active", active)
+            self.capture_status.style().polish(self.capture_status)
 
     def get_mode(self) -> int:
         """Returns current mode: 0=As Is, 1=AutoScale, 2=Custom"""
@@ -519,8 +669,30 @@ class ControlPanel(QFrame):
 
 class TerminalPanel(QFrame):
     """Panel showing console output/logs."""
+    _TS_FORMAT = "%H:%M:%S"
+    # Prefix and its colour per log type
+    _PREFIXES = {
+        "info": ("[INFO] ", "#8B949E"),
+        "success": ("[OK] ", "#3FB950"),
+        "error": ("[ERROR] ", "#F85149"),
+        "warning": ("[WARN] ", "#D29922"),
+    }
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        # Char formats are built once; lines are plain text runs, no HTML parsing
+        self._ts_format = self._char_format("#6E7681")
+        self._msg_format = self._char_format("#C9D1D9")
+        self._prefix_formats = {
+            log_type: (prefix, self._char_format(color))
+            for log_type, (prefix, color) in self._PREFIXES.items()
+        }
+        # Log lines (timestamp, log type, message) are collected here and written in one go
+        self._pending: List[Tuple[str, str, str]] = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(50)
+        self._flush_timer.timeout.connect(self._flush)
         self.setup_ui()
 
     def setup_ui(self):
@@ -555,43 +727,69 @@ class TerminalPanel(QFrame):
         layout.addWidget(header)
 
         # Terminal content
-        self.terminal = QTextEdit()
+        self.terminal = QPlainTextEdit()
         self.terminal.setObjectName("terminal")
         self.terminal.setReadOnly(True)
         self.terminal.setMinimumHeight(180)
+        # Drop the oldest lines instead of growing the document forever
+        self.terminal.setMaximumBlockCount(2000)
         layout.addWidget(self.terminal)
 
         # Initial message
         self.add_log("info", "Ready. Waiting for commands...")
 
+    @staticmethod
+    def _char_format(color: str) -> QTextCharFormat:
+        fmt = QTextCharFormat()
+        fmt.setForeground(QColor(color))
+        return fmt
+
     def add_log(self, log_type: str, message: str):
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        
-        colors = {
-            "info": "#8B949E",
-            "success": "#3FB950",
-            "error": "#F85149",
-            "warning": "#D29922"
-        }
-        prefixes = {
-            "info": "[INFO]",
-            "success": "[OK]",
-            "error": "[ERROR]",
-            "warning": "[WARN]"
-        }
-        
-        color = colors.get(log_type, colors["info"])
-        prefix = prefixes.get(log_type, prefixes["info"])
-        
-        html = f'<span style="color: #6E7681;">[{timestamp}]</span> <span style="color: {color};">{prefix}</span> <span style="color: #C9D1D9;">{message}</span><br>'
-        self.terminal.insertHtml(html)
-        self.terminal.verticalScrollBar().setValue(self.terminal.verticalScrollBar().maximum())
+        self._pending.append((time.strftime(self._TS_FORMAT), log_type, message))
+        # Armed on the first queued line only, so an idle terminal costs no wakeups
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush(self):
+        """Write all pending log lines in a single edit block."""
+        if not self._pending:
+            return
+        # Only follow new output if the user has not scrolled up to read history
+        scrollbar = self.terminal.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+        document = self.terminal.document()
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        for timestamp, log_type, message in self._pending:
+            # One block per line, so the block limit evicts whole lines
+            if not document.isEmpty():
+                cursor.insertBlock()
+            prefix, prefix_format = self._prefix_formats.get(log_type, self._prefix_formats["info"])
+            cursor.insertText(f"[{timestamp}] ", self._ts_format)
+            cursor.insertText(prefix, prefix_format)
+            cursor.insertText(message, self._msg_format)
+        cursor.endEditBlock()
+        self._pending.clear()
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
 
     def clear_logs(self):
+        self._flush()
         self.terminal.clear()
         self.add_log("info", "Console cleared. Ready...")
 
 
+@lru_cache(maxsize=1)
+def _load_qss(path: str) -> str:
+    """Read the stylesheet once; without it the window uses the plain Qt style."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return ""
+
+
 class MainWindow(QMainWindow):
     """Main application window."""
     def __init__(self):
@@ -684,20 +882,13 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(credits)
 
         # Connect device toggle to update capture button
-        for widget in self.device_panel.device_widgets:
-            widget.toggled.connect(self._update_capture_button)
+        self.device_panel.device_toggled.connect(self._update_capture_button)
 
     def load_stylesheet(self):
-        style_path = os.path.join(os.path.dirname(__file__), "style.qss")
-        if os.path.exists(style_path):
-            with open(style_path, "r") as f:
-                self.setStyleSheet(f.read())
-        else:
-            # Fallback inline stylesheet
-            self.setStyleSheet(DARK_STYLESHEET)
+        self.setStyleSheet(_load_qss(os.path.join(os.path.dirname(__file__), "style.qss")))
 
     def _update_capture_button(self):
-        enabled_count = len(self.device_panel.get_enabled_devices())
+        enabled_count = self.device_panel.enabled_count
         is_capturing = self.capture_thread is not None and self.capture_thread.isRunning()
         self.control_panel.update_capture_button(enabled_count, is_capturing)
 
@@ -708,21 +899,20 @@ class MainWindow(QMainWindow):
         self.device_panel.set_scanning(True)
         self.terminal_panel.add_log("info", "Scanning for VISA instruments...")
 
+        # Worker signals are always emitted off the GUI thread, so queue them explicitly
         self.scan_thread = ScanThread()
-        self.scan_thread.devices_found.connect(self._on_devices_found)
-        self.scan_thread.error_occurred.connect(self._on_scan_error)
+        self.scan_thread.devices_found.connect(self._on_devices_found, _QUEUED)
+        self.scan_thread.error_occurred.connect(self._on_scan_error, _QUEUED)
         self.scan_thread.start()
 
-    def _on_devices_found(self, devices: List[Device]):
+    def _on_devices_found(self, devices: List[Device], seconds: float):
         self.device_panel.set_scanning(False)
         self.device_panel.set_devices(devices)
-        
-        # Reconnect toggle signals
-        for widget in self.device_panel.device_widgets:
-            widget.toggled.connect(self._update_capture_button)
+        if not (self.capture_thread and self.capture_thread.isRunning()):
+            close_sessions(keep={d.id for d in devices})
         
         if devices:
-            self.terminal_panel.add_log("success", f"Found {len(devices)} device(s)")
+            self.terminal_panel.add_log("success", f"Found {len(devices)} device(s) in {seconds:.2f} s")
         else:
             self.terminal_panel.add_log("warning", "No VISA devices found")
         
@@ -733,9 +923,9 @@ class MainWindow(QMainWindow):
         self.terminal_panel.add_log("error", f"Scan failed: {error}")
 
     def capture_screenshots(self):
-        enabled_devices = self.device_panel.get_enabled_devices()
-        if not enabled_devices:
+        if self.device_panel.enabled_count == 0:
             return
+        enabled_devices = self.device_panel.get_enabled_devices()
 
         # Get settings
         mode = self.control_panel.get_mode()
@@ -758,10 +948,10 @@ class MainWindow(QMainWindow):
         self._update_capture_button()
 
         self.capture_thread = CaptureThread(enabled_devices, folder, mode, timebase)
-        self.capture_thread.capture_started.connect(self._on_capture_started)
-        self.capture_thread.capture_completed.connect(self._on_capture_completed)
-        self.capture_thread.capture_failed.connect(self._on_capture_failed)
-        self.capture_thread.all_completed.connect(self._on_all_captures_completed)
+        self.capture_thread.capture_started.connect(self._on_capture_started, _QUEUED)
+        self.capture_thread.capture_completed.connect(self._on_capture_completed, _QUEUED)
+        self.capture_thread.capture_failed.connect(self._on_capture_failed, _QUEUED)
+        self.capture_thread.all_completed.connect(self._on_all_captures_completed, _QUEUED)
         self.capture_thread.start()
 
         self.control_panel.update_capture_button(len(enabled_devices), True)
@@ -769,8 +959,8 @@ class MainWindow(QMainWindow):
     def _on_capture_started(self, device_id: str):
         self.terminal_panel.add_log("info", f"Capturing from {device_id}...")
 
-    def _on_capture_completed(self, device_id: str, filepath: str):
-        self.terminal_panel.add_log("success", f"Screenshot saved: {os.path.basename(filepath)}")
+    def _on_capture_completed(self, device_id: str, filepath: str, seconds: float):
+        self.terminal_panel.add_log("success", f"Screenshot saved: {os.path.basename(filepath)} ({seconds:.2f} s)")
 
     def _on_capture_failed(self, device_id: str, error: str):
         self.terminal_panel.add_log("error", f"Failed {device_id}: {error}")
@@ -779,236 +969,14 @@ class MainWindow(QMainWindow):
         self.terminal_panel.add_log("success", "All captures completed!")
         self._update_capture_button()
 
-
-# Fallback dark stylesheet (loaded from style.qss if available)
-DARK_STYLESHEET = """
-QMainWindow, QWidget {
-    background-color: #0D1117;
-    color: #C9D1D9;
-    font-family: 'Segoe UI', 'Inter', sans-serif;
-    font-size: 13px;
-}
-
-#appTitle {
-    font-size: 18px;
-    font-weight: 600;
-    color: #F0F6FC;
-}
-
-#appSubtitle {
-    font-size: 12px;
-    color: #8B949E;
-}
-
-#headerIconContainer {
-    background-color: rgba(56, 139, 253, 0.15);
-    border-radius: 10px;
-}
-
-#separator {
-    background-color: #21262D;
-}
-
-#panel {
-    background-color: #161B22;
-    border: 1px solid #30363D;
-    border-radius: 12px;
-}
-
-#panelHeader {
-    border-bottom: 1px solid #21262D;
-}
-
-#panelTitle {
-    font-weight: 500;
-    color: #C9D1D9;
-}
-
-#deviceCount {
-    font-family: 'Consolas', 'Monaco', monospace;
-    font-size: 11px;
-    color: #58A6FF;
-}
-
-#iconButton {
-    background-color: transparent;
-    border: none;
-    border-radius: 6px;
-    font-size: 14px;
-}
-
-#iconButton:hover {
-    background-color: #21262D;
-}
-
-#deviceScrollArea {
-    background-color: transparent;
-    border: none;
-}
-
-#deviceWidget {
-    background-color: #21262D;
-    border: 1px solid #30363D;
-    border-radius: 8px;
-}
-
-#deviceWidget:hover {
-    border-color: #58A6FF;
-}
-
-#deviceWidget[selected="true"] {
-    background-color: rgba(56, 139, 253, 0.1);
-    border-color: #58A6FF;
-}
-
-#statusIndicator {
-    border-radius: 4px;
-}
-
-#statusIndicator[connected="true"] {
-    background-color: #3FB950;
-}
-
-#statusIndicator[connected="false"] {
-    background-color: #F85149;
-}
-
-#deviceName {
-    font-weight: 500;
-    color: #C9D1D9;
-}
-
-#deviceDetails {
-    font-family: 'Consolas', 'Monaco', monospace;
-    font-size: 11px;
-    color: #8B949E;
-}
-
-#emptyLabel {
-    color: #8B949E;
-    padding: 24px;
-}
-
-#captureButton {
-    background-color: #238636;
-    color: white;
-    border: none;
-    border-radius: 8px;
-    font-size: 16px;
-    font-weight: 600;
-}
-
-#captureButton:hover {
-    background-color: #2EA043;
-}
-
-#captureButton:disabled {
-    background-color: #21262D;
-    color: #484F58;
-}
-
-#captureStatus {
-    font-size: 11px;
-    color: #8B949E;
-    margin-top: 8px;
-}
-
-#captureStatusActive {
-    font-size: 11px;
-    color: #58A6FF;
-    font-weight: 500;
-    margin-top: 8px;
-}
-
-#settingLabel {
-    font-weight: 500;
-    color: #C9D1D9;
-}
-
-#toggleLabel {
-    font-family: 'Consolas', 'Monaco', monospace;
-    font-size: 11px;
-    color: #C9D1D9;
-}
-
-#toggleLabelInactive {
-    font-family: 'Consolas', 'Monaco', monospace;
-    font-size: 11px;
-    color: #484F58;
-}
-
-#toggleSwitch::indicator {
-    width: 36px;
-    height: 20px;
-}
-
-#settingInput {
-    background-color: #21262D;
-    border: 1px solid #30363D;
-    border-radius: 6px;
-    padding: 8px 12px;
-    color: #C9D1D9;
-    font-family: 'Consolas', 'Monaco', monospace;
-}
-
-#settingInput:focus {
-    border-color: #58A6FF;
-}
-
-#settingHint {
-    font-size: 11px;
-    color: #8B949E;
-}
-
-#terminal {
-    background-color: #0D1117;
-    border: none;
-    border-top: 1px solid #21262D;
-    padding: 12px;
-    font-family: 'Consolas', 'Monaco', monospace;
-    font-size: 12px;
-}
-
-#footer {
-    font-size: 11px;
-    color: #484F58;
-    padding-top: 12px;
-    border-top: 1px solid #21262D;
-}
-
-QScrollBar:vertical {
-    background-color: #0D1117;
-    width: 8px;
-    border-radius: 4px;
-}
-
-QScrollBar::handle:vertical {
-    background-color: #30363D;
-    border-radius: 4px;
-    min-height: 20px;
-}
-
-QScrollBar::handle:vertical:hover {
-    background-color: #484F58;
-}
-
-QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-    height: 0px;
-}
-
-QCheckBox::indicator {
-    width: 16px;
-    height: 16px;
-    border-radius: 4px;
-    border: 1px solid #30363D;
-    background-color: #21262D;
-}
-
-QCheckBox::indicator:checked {
-    background-color: #58A6FF;
-    border-color: #58A6FF;
-}
-"""
+    def closeEvent(self, event):
+        # A running capture holds its session locks for up to the transfer timeout,
+        # so closing them here would freeze the window; the atexit hooks close them
+        # once the capture is done
+        if not (self.capture_thread and self.capture_thread.isRunning()):
+            close_sessions()
+            close_rm()
+        super().closeEvent(event)
 
 
 def main():
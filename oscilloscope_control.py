@@ -1,16 +1,27 @@
-import datetime
+import atexit
+import logging
 import os
+import re
+import threading
 import time
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+from typing import TYPE_CHECKING, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
 
-import pyvisa
-from pyvisa.errors import VisaIOError
-from pyvisa.resources import MessageBasedResource
+# pyvisa is imported on first use, so importing this module (e.g. by the GUI)
+# does not pay for loading the VISA stack before any instrument is touched
+if TYPE_CHECKING:
+    import pyvisa
+    from pyvisa.resources import MessageBasedResource
+
+logger = logging.getLogger(__name__)
 
 # CONFIGURATION CONSTANTS FOR COMMONLY TUNED SETTINGS
 AUTOSCALE_DEFAULT_ENABLED = False  # SET TO FALSE TO KEEP MANUAL SETTINGS BEFORE SCREENSHOTS.
 AUTOSCALE_WAIT_SECONDS = 3.0  # HOW LONG TO WAIT AFTER AUTOSCALE. USED WHEN AUTOSCALE IS TRUE.
 TIMEBASE_SECONDS_PER_DIVISION = 0.0002  # REQUIRED WHEN AUTOSCALE_DEFAULT_ENABLED IS FALSE (0.05 == 50MS PER DIVISION).
+COMMAND_TIMEOUT_MS = 2000  # VISA TIMEOUT FOR ORDINARY COMMANDS AND QUERIES.
+TRANSFER_TIMEOUT_MS = 20000  # VISA TIMEOUT WHILE A SCREENSHOT IS BEING TRANSFERRED.
 
 # VENDOR-SPECIFIC SCPI COMMANDS
 VENDOR_COMMANDS = {
@@ -20,6 +31,9 @@ VENDOR_COMMANDS = {
         'timebase_scale': ':TIMebase:SCALe',
         'timebase_format': '{value}',  # Keysight accepts plain number
         'autoscale_wait': 3.0,  # Keysight is faster
+        'compound_commands': True,  # Accepts ';'-joined commands in one write
+        'image_format': 'png',  # :DISPlay:DATA? PNG, COLOR (binblock)
+        'idn_manufacturers': ('KEYSIGHT', 'AGILENT'),  # *IDN? manufacturer field prefixes
     },
     'siglent': {
         'autoscale_enable': 'ASET',  # Siglent uses ASET command
@@ -27,14 +41,103 @@ VENDOR_COMMANDS = {
         'timebase_scale': 'TDIV',  # Siglent uses TDIV command
         'timebase_format': '{value}',  # e.g., TDIV 5E-3
         'autoscale_wait': 6.0,  # Siglent needs more time to render waveform after AutoScale
+        'compound_commands': False,  # Send every command as its own write
+        'image_format': 'bmp',  # :SCDP returns a raw BMP without binblock header
+        'idn_manufacturers': ('SIGLENT',),
     },
 }
 
-# KNOWN OSCILLOSCOPE USB VENDOR/PRODUCT IDS FOR AUTO-DETECTION
-KNOWN_OSCILLOSCOPES = [
-    '0x0957',   # Keysight / Agilent
-    '0xF4EC',   # Siglent
-]
+# KNOWN OSCILLOSCOPE USB VENDOR IDS FOR AUTO-DETECTION -> VENDOR KEY IN VENDOR_COMMANDS
+KNOWN_OSCILLOSCOPES = {
+    '0x0957': 'keysight',   # Keysight / Agilent
+    '0xF4EC': 'siglent',    # Siglent
+}
+
+# SERIALISES rm.open_resource() ACROSS THREADS ON PYVISA-PY, WHICH IS NOT THREAD SAFE
+# WHILE OPENING SESSIONS. NI-VISA OPENS ARE NOT SERIALISED (SEE visa_open_lock()).
+# READS AND WRITES ON AN ALREADY OPEN SESSION DO NOT TAKE THIS LOCK.
+VISA_OPEN_LOCK = threading.Lock()
+
+# USB VENDOR ID FIELD OF A VISA RESOURCE NAME -> VENDOR KEY IN VENDOR_COMMANDS
+_VENDOR_RE = re.compile(r'USB\d*::(0x[0-9a-f]+)::', re.IGNORECASE)
+_VENDOR_MAP = {vendor_id.lower(): vendor for vendor_id, vendor in KNOWN_OSCILLOSCOPES.items()}
+
+# Shared VISA resource manager, created lazily by get_rm() and closed at exit
+_RM: Optional["pyvisa.ResourceManager"] = None
+_RM_LOCK = threading.Lock()
+
+
+def get_rm() -> "pyvisa.ResourceManager":
+    """
+    Returns the shared ResourceManager, creating it on first use.
+    Creating one loads the VISA library, so it is done only once per process.
+    """
+    global _RM
+    with _RM_LOCK:
+        if _RM is None:
+            import pyvisa
+            _RM = pyvisa.ResourceManager()
+        return _RM
+
+
+def close_rm() -> None:
+    """
+    Closes the shared ResourceManager if it was ever created.
+    """
+    global _RM
+    with _RM_LOCK:
+        if _RM is not None:
+            _RM.close()
+            _RM = None
+
+
+atexit.register(close_rm)
+
+
+def visa_open_lock(rm: "pyvisa.ResourceManager"):
+    """
+    Returns the context manager to hold around rm.open_resource(): VISA_OPEN_LOCK
+    on the pyvisa-py backend, a no-op for NI-VISA and other thread-safe libraries.
+    """
+    if type(rm.visalib).__module__.startswith('pyvisa_py'):
+        return VISA_OPEN_LOCK
+    return nullcontext()
+
+
+# Last list_resources() result as (time.monotonic() stamp, resources)
+_RESOURCE_LIST_TTL = 2.0
+_RESOURCES: Tuple[float, Tuple[str, ...]] = (float('-inf'), ())
+_RESOURCES_LOCK = threading.Lock()
+
+
+def list_resources(refresh: bool = False) -> Tuple[str, ...]:
+    """
+    Returns the VISA resources of the shared ResourceManager. Enumerating them
+    can take a while, so the result is reused for _RESOURCE_LIST_TTL seconds
+    unless 'refresh' is True (e.g. when the user explicitly rescans).
+    """
+    global _RESOURCES
+    with _RESOURCES_LOCK:
+        stamp, resources = _RESOURCES
+        now = time.monotonic()
+        if refresh or now - stamp > _RESOURCE_LIST_TTL:
+            resources = get_rm().list_resources()
+            _RESOURCES = (now, resources)
+        return resources
+
+
+# Folders already created in this process, so repeated captures skip makedirs
+_FOLDERS_READY = set()
+
+
+def ensure_folder(folder: str, refresh: bool = False) -> None:
+    """
+    Creates 'folder' (and its parents) the first time it is used in this process,
+    or again when 'refresh' is True (e.g. after it was deleted in the meantime).
+    """
+    if refresh or folder not in _FOLDERS_READY:
+        os.makedirs(folder, exist_ok=True)
+        _FOLDERS_READY.add(folder)
 
 
 def detect_oscilloscope() -> Optional[str]:
@@ -43,8 +146,8 @@ def detect_oscilloscope() -> Optional[str]:
     matching a known vendor ID from KNOWN_OSCILLOSCOPES that is actually reachable.
     Returns None if no known oscilloscope is found or responds.
     """
-    rm = pyvisa.ResourceManager()
-    resources = rm.list_resources()
+    rm = get_rm()
+    resources = list_resources()
     candidates = []
     for res in resources:
         if res.startswith('USB'):
@@ -53,21 +156,41 @@ def detect_oscilloscope() -> Optional[str]:
                     candidates.append(res)
                     break
 
-    # Try to open each candidate and verify it responds
-    for res in candidates:
+    # Probe all candidates at once, so a dead one does not delay a live one by its timeout
+    if candidates:
+        executor = ThreadPoolExecutor(max_workers=len(candidates))
         try:
+            futures = [executor.submit(_probe_oscilloscope, rm, res) for res in candidates]
+            for future in as_completed(futures):
+                res = future.result()
+                if res is not None:
+                    logger.info("Detected and verified oscilloscope: %s", res)
+                    return res
+        finally:
+            # Do not wait for probes that are still running into their timeout
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    logger.info("No known oscilloscope detected or responding.")
+    return None
+
+
+def _probe_oscilloscope(rm: "pyvisa.ResourceManager", res: str) -> Optional[str]:
+    """
+    Opens 'res' and checks that it answers *IDN?. Returns 'res' if it does, else None.
+    """
+    scope = None
+    try:
+        with visa_open_lock(rm):
             scope = rm.open_resource(res)
-            scope.timeout = 5000
-            scope.query('*IDN?')  # Check if device actually responds
+        scope.timeout = 5000
+        scope.query('*IDN?')  # Check if device actually responds
+        return res
+    except Exception as e:
+        logger.debug("Skipping %s (not responding): %s", res, e)
+        return None
+    finally:
+        if scope is not None:
             scope.close()
-            print(f"Detected and verified oscilloscope: {res}")
-            return res
-        except Exception as e:
-            print(f"Skipping {res} (not responding): {e}")
-            continue
-
-    print("No known oscilloscope detected or responding.")
-    return None
 
 
 def get_oscilloscope_vendor(resource_name: str) -> str:
@@ -75,105 +198,153 @@ def get_oscilloscope_vendor(resource_name: str) -> str:
     Returns the vendor name based on the USB vendor ID in the resource name.
     Supported: 'keysight', 'siglent', 'unknown'
     """
-    res_lower = resource_name.lower()
-    if '0x0957' in res_lower:
-        return 'keysight'
-    elif '0xf4ec' in res_lower:
-        return 'siglent'
-    return 'unknown'
+    match = _VENDOR_RE.match(resource_name)
+    return _VENDOR_MAP.get(match.group(1).lower(), 'unknown') if match else 'unknown'
 
 
-def open_scope(resource_name: str) -> MessageBasedResource:
+def open_scope(resource_name: str,
+               rm: Optional["pyvisa.ResourceManager"] = None,
+               vendor: Optional[str] = None
+               ) -> "MessageBasedResource":
     """
     Opens a connection to the oscilloscope and configures basic communication parameters.
+    Uses the shared ResourceManager unless another one is passed as 'rm'.
+    'vendor' overrides the vendor looked up from the resource name.
     Returns a MessageBasedResource object to avoid warnings in PyCharm.
     """
-    rm = pyvisa.ResourceManager()
-    scope: MessageBasedResource = rm.open_resource(resource_name)
+    if rm is None:
+        rm = get_rm()
+    with visa_open_lock(rm):
+        scope: "MessageBasedResource" = rm.open_resource(resource_name)
 
-    # Increase timeout and chunk_size because screenshot transfers can be large
-    scope.timeout = 20000
-    scope.chunk_size = 102400
+    # Short timeout so a hung instrument fails fast; screenshot reads raise it
+    # with transfer_timeout(). 1 MiB chunks let a typical screenshot arrive in
+    # one or two bulk transfers
+    scope.timeout = COMMAND_TIMEOUT_MS
+    scope.chunk_size = 1024 * 1024
 
     scope.write_termination = '\n'
     scope.read_termination = '\n'
 
     # Disable additional SCPI headers if the oscilloscope sends them (Keysight only)
-    vendor = get_oscilloscope_vendor(resource_name)
+    vendor = vendor or get_oscilloscope_vendor(resource_name)
     if vendor == 'keysight':
         scope.write(':SYSTem:HEADer OFF')
 
     return scope
 
 
+@contextmanager
+def transfer_timeout(scope: "MessageBasedResource", timeout_ms: int = TRANSFER_TIMEOUT_MS) -> Iterator["MessageBasedResource"]:
+    """
+    Raises the VISA timeout of 'scope' to 'timeout_ms' for a screenshot transfer
+    and restores the previous value afterwards.
+    """
+    previous = scope.timeout
+    scope.timeout = max(previous, timeout_ms)
+    try:
+        yield scope
+    finally:
+        scope.timeout = previous
+
+
 def autoscale_oscilloscope(resource_name: str, wait_time: float = AUTOSCALE_WAIT_SECONDS) -> None:
     """
     Opens a connection to the oscilloscope and issues the :AUToscale command.
     Then optionally waits 'wait_time' seconds so the waveform has time to settle.
     """
-    scope = open_scope(resource_name)
-    try:
-        _set_autoscale_state(scope, enabled=True, wait_time=wait_time)
-    finally:
-        scope.close()
+    get_session(resource_name).autoscale(enabled=True, wait_time=wait_time)
 
 
-def read_binblock(scope: MessageBasedResource) -> bytes:
+def _read_binblock_header(scope: "MessageBasedResource") -> int:
     """
-    Reads a binblock formatted as '#NLLLL...(data)' in a loop
-    until the entire specified number of bytes (LLLL) is retrieved.
-    Returns raw bytes.
+    Reads the '#NLLLL' header of a binblock and returns the data length LLLL.
     """
     header = scope.read_bytes(2)
-    if not header.startswith(b'#'):
+    if len(header) != 2 or header[0] != 0x23:  # '#'
         raise ValueError(f"Invalid binblock header (missing '#'): {header}")
 
-    digits = int(header[1:2])
-    length_str = scope.read_bytes(digits)
-    data_length = int(length_str)
+    # Number of length digits as a plain int, without slicing and parsing
+    digits = header[1] - 0x30  # '0'
+    if not 1 <= digits <= 9:
+        raise ValueError(f"Unsupported binblock header (length digits {header[1:2]}): {header}")
+    return int(scope.read_bytes(digits))
+
+
+def read_binblock(scope: "MessageBasedResource") -> bytearray:
+    """
+    Reads a binblock formatted as '#NLLLL...(data)' in a loop
+    until the entire specified number of bytes (LLLL) is retrieved.
+    The termination character that follows the block is consumed as well,
+    so the session can be reused. Returns the raw data as a bytearray
+    (the filled buffer itself, not a copy).
+    """
+    data_length = _read_binblock_header(scope)
+
+    # The length is known up front, so fill a pre-sized buffer in place
+    data = bytearray(data_length)
+    view = memoryview(data)
+    offset = 0
+    # Read in pieces of the resource's chunk_size (at least 64 KiB)
+    chunk = max(scope.chunk_size, 65536)
+
+    while offset < data_length:
+        block = scope.read_bytes(min(chunk, data_length - offset))
+        view[offset:offset + len(block)] = block
+        offset += len(block)
+
+    view.release()
+    if scope.read_termination:
+        scope.read_bytes(len(scope.read_termination))
+
+    return data
+
+
+def read_binblock_to(scope: "MessageBasedResource", out_file: BinaryIO) -> int:
+    """
+    Reads a binblock like read_binblock, but writes every chunk straight to
+    'out_file' instead of collecting the data in memory. The termination
+    character that follows the block is consumed as well.
+    Returns the number of data bytes written.
+    """
+    data_length = _read_binblock_header(scope)
 
-    data = bytearray()
     bytes_left = data_length
-    chunk = 65536
+    chunk = max(scope.chunk_size, 65536)
 
     while bytes_left > 0:
-        to_read = min(chunk, bytes_left)
-        block = scope.read_bytes(to_read)
-        data.extend(block)
+        block = scope.read_bytes(min(chunk, bytes_left))
+        out_file.write(block)
         bytes_left -= len(block)
 
-    return bytes(data)
+    if scope.read_termination:
+        scope.read_bytes(len(scope.read_termination))
 
+    return data_length
 
-def _set_autoscale_state(scope: MessageBasedResource, enabled: bool, vendor: str = 'keysight', wait_time: Optional[float] = None) -> None:
+
+def read_bmp_to(scope: "MessageBasedResource", out_file: BinaryIO) -> int:
     """
-    Enables or disables AutoScale on the already opened oscilloscope handle.
-    Uses vendor-specific commands from VENDOR_COMMANDS dictionary.
-    If wait_time is None, uses vendor-specific default wait time.
+    Reads a raw BMP screen dump (Siglent :SCDP) and writes it chunk by chunk
+    to 'out_file'. The size comes from the BMP file header, so bytes inside
+    the image that look like a termination character do not end the read.
+    Returns the number of bytes written.
     """
-    commands = VENDOR_COMMANDS.get(vendor, VENDOR_COMMANDS['keysight'])
-    
-    if enabled:
-        command = commands['autoscale_enable']
-    else:
-        command = commands['autoscale_disable']
-        if command is None:
-            # Vendor doesn't support disable command - just skip
-            print(f"Note: {vendor} doesn't support AutoScale disable, skipping.")
-            return
-    
-    try:
-        scope.write(command)
-    except VisaIOError as error:
-        direction = 'enable' if enabled else 'disable'
-        raise RuntimeError(f"Failed to {direction} AutoScale via '{command}'.") from error
+    header = scope.read_bytes(6)
+    if not header.startswith(b'BM'):
+        raise ValueError(f"Invalid BMP header (missing 'BM'): {header}")
+    out_file.write(header)
+
+    file_size = int.from_bytes(header[2:6], 'little')
+    bytes_left = file_size - len(header)
+    chunk = max(scope.chunk_size, 65536)
+
+    while bytes_left > 0:
+        block = scope.read_bytes(min(chunk, bytes_left))
+        out_file.write(block)
+        bytes_left -= len(block)
 
-    if enabled:
-        # Use vendor-specific wait time if not provided
-        actual_wait = wait_time if wait_time is not None else commands.get('autoscale_wait', AUTOSCALE_WAIT_SECONDS)
-        if actual_wait > 0:
-            print(f"Waiting {actual_wait}s for {vendor} to settle...")
-            time.sleep(actual_wait)
+    return file_size
 
 
 def set_autoscale_state(resource_name: str, enabled: bool, wait_time: float = AUTOSCALE_WAIT_SECONDS) -> None:
@@ -182,31 +353,7 @@ def set_autoscale_state(resource_name: str, enabled: bool, wait_time: float = AU
     Use this when you need to preserve manual settings before a screenshot.
     Automatically detects vendor and uses appropriate SCPI commands.
     """
-    vendor = get_oscilloscope_vendor(resource_name)
-    scope = open_scope(resource_name)
-    try:
-        _set_autoscale_state(scope, enabled=enabled, vendor=vendor, wait_time=wait_time)
-    finally:
-        scope.close()
-
-
-def _set_timebase_scale(scope: MessageBasedResource,
-                        seconds_per_division: float = TIMEBASE_SECONDS_PER_DIVISION,
-                        vendor: str = 'keysight') -> None:
-    """
-    Sets the time base scale (seconds per division) on an opened oscilloscope handle.
-    Uses vendor-specific SCPI commands.
-    """
-    if seconds_per_division <= 0:
-        raise ValueError('seconds_per_division must be greater than zero.')
-    
-    commands = VENDOR_COMMANDS.get(vendor, VENDOR_COMMANDS['keysight'])
-    cmd = commands['timebase_scale']
-    
-    # Format the command with the value
-    full_command = f'{cmd} {seconds_per_division}'
-    print(f"Setting timebase: {full_command}")
-    scope.write(full_command)
+    get_session(resource_name).autoscale(enabled=enabled, wait_time=wait_time)
 
 
 def set_timebase_scale(resource_name: str,
@@ -216,85 +363,360 @@ def set_timebase_scale(resource_name: str,
     Useful before taking screenshots when AutoScale is disabled.
     Automatically detects vendor and uses appropriate SCPI commands.
     """
-    vendor = get_oscilloscope_vendor(resource_name)
-    scope = open_scope(resource_name)
-    try:
-        _set_timebase_scale(scope, seconds_per_division=seconds_per_division, vendor=vendor)
-    finally:
-        scope.close()
+    get_session(resource_name).set_timebase(seconds_per_division)
 
 
-def capture_screenshot_display(resource_name: str,
-                               folder: str = r"C:\Users\35387\Pictures\Screenshots",
-                               autoscale: Optional[bool] = None,
-                               autoscale_wait: Optional[float] = None,
-                               timebase_scale: Optional[float] = None
-                               ) -> None:
+def prepare_display(resource_name: str,
+                    autoscale: Optional[bool] = None,
+                    autoscale_wait: Optional[float] = None,
+                    timebase_scale: Optional[float] = None
+                    ) -> None:
     """
-    Opens a connection to the oscilloscope, acquires a screenshot
-    using the :DISPlay:DATA? PNG, COLOR command in binblock form, and saves a PNG file
-    with a unique timestamped filename. AutoScale and timebase behaviour default
-    to the configuration constants defined at the top of this module unless the
-    optional parameters override them.
+    Applies the same AutoScale / timebase settings as capture_screenshot_display,
+    without taking a screenshot. Follow it with
+    capture_screenshot_display(..., configure_display=False) to capture as it is.
     """
-    scope = open_scope(resource_name)
+    get_session(resource_name).prepare_display(autoscale=autoscale,
+                                               autoscale_wait=autoscale_wait,
+                                               timebase_scale=timebase_scale)
 
-    try:
+
+class ScopeSession:
+    """
+    Keeps one oscilloscope connection open across several operations, so the
+    VISA session is set up once instead of for every command. The connection
+    is opened on first use and reopened after an operation fails. Can be used
+    as a context manager, which closes the connection on exit.
+    """
+
+    def __init__(self, resource_name: str, rm: Optional["pyvisa.ResourceManager"] = None,
+                 vendor: Optional[str] = None):
+        self.resource_name = resource_name
+        # 'vendor' overrides the lookup by USB vendor ID (e.g. from *IDN? for LAN instruments)
+        self.vendor = vendor or get_oscilloscope_vendor(resource_name)
+        # Vendor-specific commands are resolved once for this instrument
+        commands = VENDOR_COMMANDS.get(self.vendor, VENDOR_COMMANDS['keysight'])
+        self.image_format: str = commands['image_format']
+        self._cmd_autoscale_on: str = commands['autoscale_enable']
+        self._cmd_autoscale_off: Optional[str] = commands['autoscale_disable']
+        self._fmt_timebase = (commands['timebase_scale'] + ' {}').format
+        self._autoscale_wait: float = commands.get('autoscale_wait', AUTOSCALE_WAIT_SECONDS)
+        self._compound: bool = commands.get('compound_commands', False)
+        self._rm = rm
+        self._scope: Optional["MessageBasedResource"] = None
+        # One operation at a time per instrument
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'ScopeSession':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @contextmanager
+    def connection(self) -> Iterator["MessageBasedResource"]:
+        """
+        Yields the open scope handle while holding the session lock.
+        If the block raises, the connection is closed because it may still
+        hold unread data; the next call opens a fresh one.
+        """
+        with self._lock:
+            if self._scope is None:
+                self._scope = open_scope(self.resource_name, rm=self._rm, vendor=self.vendor)
+            try:
+                yield self._scope
+            except Exception:
+                self._close_scope()
+                raise
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_scope()
+
+    def _close_scope(self) -> None:
+        scope, self._scope = self._scope, None
+        if scope is not None:
+            try:
+                scope.close()
+            except Exception:
+                pass
+
+    def autoscale(self, enabled: bool = True, wait_time: Optional[float] = None) -> None:
+        with self.connection() as scope:
+            self._write_autoscale(scope, enabled, wait_time)
+
+    def set_timebase(self, seconds_per_division: float = TIMEBASE_SECONDS_PER_DIVISION) -> None:
+        command = self._timebase_command(seconds_per_division)
+        with self.connection() as scope:
+            logger.debug("Setting timebase: %s", command)
+            scope.write(command)
+
+    def _timebase_command(self, seconds_per_division: float) -> str:
+        """
+        Returns the SCPI command setting the time base scale (seconds per division).
+        """
+        if seconds_per_division <= 0:
+            raise ValueError('seconds_per_division must be greater than zero.')
+        return self._fmt_timebase(seconds_per_division)
+
+    def _write_autoscale(self, scope: "MessageBasedResource", enabled: bool, wait_time: Optional[float] = None) -> None:
+        """
+        Enables or disables AutoScale on the open handle.
+        If wait_time is None, waits the vendor-specific default after enabling.
+        """
+        command = self._cmd_autoscale_on if enabled else self._cmd_autoscale_off
+        if command is None:
+            # Vendor doesn't support disable command - just skip
+            logger.debug("Note: %s doesn't support AutoScale disable, skipping.", self.vendor)
+            return
+
+        from pyvisa.errors import VisaIOError
+
+        try:
+            scope.write(command)
+        except VisaIOError as error:
+            direction = 'enable' if enabled else 'disable'
+            raise RuntimeError(f"Failed to {direction} AutoScale via '{command}'.") from error
+
+        if enabled:
+            actual_wait = wait_time if wait_time is not None else self._autoscale_wait
+            if actual_wait > 0:
+                logger.debug("Waiting %ss for %s to settle...", actual_wait, self.vendor)
+                time.sleep(actual_wait)
+
+    def prepare_display(self,
+                        autoscale: Optional[bool] = None,
+                        autoscale_wait: Optional[float] = None,
+                        timebase_scale: Optional[float] = None
+                        ) -> None:
+        """
+        Applies the AutoScale / timebase settings without taking a screenshot.
+        Defaults come from the configuration constants at the top of this module.
+        """
+        with self.connection() as scope:
+            self._apply_display_settings(scope, autoscale, autoscale_wait, timebase_scale)
+
+    def _apply_display_settings(self,
+                                scope: "MessageBasedResource",
+                                autoscale: Optional[bool],
+                                autoscale_wait: Optional[float],
+                                timebase_scale: Optional[float]
+                                ) -> None:
+        from pyvisa.errors import VisaIOError
+
+        vendor = self.vendor
         autoscale_setting = AUTOSCALE_DEFAULT_ENABLED if autoscale is None else autoscale
-        vendor = get_oscilloscope_vendor(resource_name)
 
         if autoscale_setting:
             # Use provided wait time or vendor-specific default (None = use vendor default)
-            _set_autoscale_state(scope, enabled=True, vendor=vendor, wait_time=autoscale_wait)
+            self._write_autoscale(scope, True, autoscale_wait)
             if timebase_scale is not None:
-                _set_timebase_scale(scope, seconds_per_division=timebase_scale, vendor=vendor)
+                command = self._timebase_command(timebase_scale)
+                logger.debug("Setting timebase: %s", command)
+                scope.write(command)
         else:
-            # For Siglent: just don't run autoscale, it will keep manual settings
-            # For Keysight: try to disable autoscale explicitly
-            if vendor != 'siglent':
-                _set_autoscale_state(scope, enabled=False, vendor=vendor)
             manual_scale = timebase_scale if timebase_scale is not None else TIMEBASE_SECONDS_PER_DIVISION
             if manual_scale is None:
                 raise ValueError('Provide timebase_scale argument or configure TIMEBASE_SECONDS_PER_DIVISION when AutoScale is disabled.')
-            _set_timebase_scale(scope, seconds_per_division=manual_scale, vendor=vendor)
-
-        # Determine vendor and use appropriate screenshot command
-        vendor = get_oscilloscope_vendor(resource_name)
-        
-        if vendor == 'siglent':
-            # Siglent uses :SCDP command for screen dump (returns BMP by default)
-            scope.write(':SCDP')
-            # Siglent returns raw data without binblock header, read all available
-            time.sleep(1)  # Give oscilloscope time to prepare data
-            image_data = scope.read_raw()
-        else:
-            # Keysight/Agilent uses :DISPlay:DATA? PNG, COLOR
-            scope.write(':DISPlay:DATA? PNG, COLOR')
-            image_data = read_binblock(scope)
+            setup = [self._timebase_command(manual_scale)]
+            # For Siglent: just don't run autoscale, it will keep manual settings
+            # For Keysight: try to disable autoscale explicitly. It goes last because
+            # some models reject it, and a rejected command drops the rest of the message.
+            if vendor != 'siglent' and self._cmd_autoscale_off is not None:
+                setup.append(self._cmd_autoscale_off)
+            # One write (one bus round-trip) for all settings where the vendor allows it
+            if self._compound:
+                setup = [';'.join(setup)]
+            for command in setup:
+                logger.debug("Applying settings: %s", command)
+                try:
+                    scope.write(command)
+                except VisaIOError as error:
+                    raise RuntimeError(f"Failed to apply settings via '{command}'.") from error
+
+    def capture(self,
+                folder: str,
+                autoscale: Optional[bool] = None,
+                autoscale_wait: Optional[float] = None,
+                timebase_scale: Optional[float] = None,
+                filepath: Optional[str] = None,
+                configure_display: bool = True
+                ) -> str:
+        """
+        Applies the AutoScale / timebase settings, acquires a screenshot and saves
+        it in 'folder' with a unique timestamped filename, or at 'filepath' if one
+        is given. With configure_display=False the display is captured as it is and
+        no settings are sent. Returns the file path.
+        """
+        with self.connection() as scope:
+            if configure_display:
+                self._apply_display_settings(scope, autoscale, autoscale_wait, timebase_scale)
+
+            if filepath is None:
+                # Build a unique filename with date and time
+                timestamp_str = time.strftime("%Y%m%d_%H%M%S")
+                filename = f"scope_screenshot_{timestamp_str}.{self.image_format}"
+
+                # Ensure the target folder exists
+                ensure_folder(folder)
+                full_path = os.path.join(folder, filename)
+            else:
+                full_path = filepath
+
+            # The file is opened first so the image can be written while it arrives
+            try:
+                f = open(full_path, 'wb')
+            except FileNotFoundError:
+                # The folder was removed since it was last created
+                ensure_folder(os.path.dirname(full_path) or '.', refresh=True)
+                f = open(full_path, 'wb')
+            try:
+                with f, transfer_timeout(scope):
+                    if self.image_format == 'bmp':
+                        # Siglent uses :SCDP command for screen dump (returns BMP by default)
+                        scope.write(':SCDP')
+                        # Siglent returns raw data without binblock header; the BMP header
+                        # carries the file size, so exactly that many bytes are read
+                        read_bmp_to(scope, f)
+                    else:
+                        # Keysight/Agilent uses :DISPlay:DATA? PNG, COLOR
+                        scope.write(':DISPlay:DATA? PNG, COLOR')
+                        read_binblock_to(scope, f)
+            except Exception:
+                # Do not leave a truncated image behind
+                if os.path.exists(full_path):
+                    os.remove(full_path)
+                raise
+
+        logger.info("Screenshot zapisany do: %s", full_path)
+        return full_path
+
+
+# Open sessions by resource name, shared by the module-level helpers below
+_SESSIONS: Dict[str, ScopeSession] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def get_session(resource_name: str, vendor: Optional[str] = None) -> ScopeSession:
+    """
+    Returns the shared ScopeSession for 'resource_name', creating it on first use.
+    If 'vendor' is given and differs from the cached session's, the session is
+    replaced by one using that vendor's commands.
+    """
+    stale = None
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(resource_name)
+        if session is None or (vendor is not None and session.vendor != vendor):
+            stale = session
+            session = _SESSIONS[resource_name] = ScopeSession(resource_name, vendor=vendor)
+    if stale is not None:
+        stale.close()
+    return session
+
+
+def cached_session(resource_name: str) -> Optional[ScopeSession]:
+    """
+    Returns the shared ScopeSession for 'resource_name' if one exists, without creating it.
+    """
+    with _SESSIONS_LOCK:
+        return _SESSIONS.get(resource_name)
 
-        # Build a unique filename with date and time
-        timestamp_str = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        ext = 'bmp' if vendor == 'siglent' else 'png'
-        filename = f"scope_screenshot_{timestamp_str}.{ext}"
 
-        # Ensure the target folder exists
-        os.makedirs(folder, exist_ok=True)
+def close_sessions(keep=()) -> None:
+    """
+    Closes and forgets the shared sessions of all resources not listed in 'keep'.
+    """
+    with _SESSIONS_LOCK:
+        stale = [name for name in _SESSIONS if name not in keep]
+        sessions = [_SESSIONS.pop(name) for name in stale]
+    for session in sessions:
+        session.close()
 
-        full_path = os.path.join(folder, filename)
-        with open(full_path, 'wb') as f:
-            f.write(image_data)
 
-        print(f"Screenshot zapisany do: {full_path}")
+# Registered after close_rm, so it runs first at exit
+atexit.register(close_sessions)
 
-    finally:
-        scope.close()
+
+def capture_screenshot_display(resource_name: str,
+                               folder: str = r"C:\Users\35387\Pictures\Screenshots",
+                               autoscale: Optional[bool] = None,
+                               autoscale_wait: Optional[float] = None,
+                               timebase_scale: Optional[float] = None,
+                               filepath: Optional[str] = None,
+                               configure_display: bool = True,
+                               vendor: Optional[str] = None
+                               ) -> str:
+    """
+    Acquires a screenshot over the shared session of 'resource_name' in the
+    vendor's image format (PNG binblock, or BMP for Siglent) and saves it with a
+    unique timestamped filename (or at 'filepath' if given). 'vendor' overrides the
+    vendor looked up from the resource name. AutoScale and
+    timebase behaviour default to the configuration constants defined at the top of
+    this module unless the optional parameters override them. Pass
+    configure_display=False to capture the display as it is, without sending any
+    settings first.
+    Returns the path of the saved file.
+    """
+    return get_session(resource_name, vendor).capture(folder,
+                                                      autoscale=autoscale,
+                                                      autoscale_wait=autoscale_wait,
+                                                      timebase_scale=timebase_scale,
+                                                      filepath=filepath,
+                                                      configure_display=configure_display)
+
+
+def capture_many(resource_names: Iterable[str],
+                 folder: str = r"C:\Users\35387\Pictures\Screenshots",
+                 autoscale: Optional[bool] = None,
+                 autoscale_wait: Optional[float] = None,
+                 timebase_scale: Optional[float] = None
+                 ) -> Dict[str, str]:
+    """
+    Captures screenshots from several oscilloscopes at the same time, one worker
+    thread per instrument. Instruments on the same GPIB board share one bus, so
+    those are captured one after another in a single worker.
+    Returns the saved file path per resource; failed captures are reported and left out.
+    """
+    resource_names = list(resource_names)
+    timestamp_str = time.strftime("%Y%m%d_%H%M%S")
+    ensure_folder(folder)
+
+    # Unique file per instrument, even when they are captured within the same second
+    groups: Dict[str, List[Tuple[str, str]]] = {}
+    for index, res in enumerate(resource_names):
+        ext = get_session(res).image_format
+        filepath = os.path.join(folder, f"scope_screenshot_{timestamp_str}_{index:02d}.{ext}")
+        board = res.split('::', 1)[0]
+        groups.setdefault(board if board.upper().startswith('GPIB') else res, []).append((res, filepath))
+
+    def capture_group(jobs: List[Tuple[str, str]]) -> Dict[str, str]:
+        saved = {}
+        for res, filepath in jobs:
+            try:
+                saved[res] = capture_screenshot_display(res, folder,
+                                                        autoscale=autoscale,
+                                                        autoscale_wait=autoscale_wait,
+                                                        timebase_scale=timebase_scale,
+                                                        filepath=filepath)
+            except Exception as e:
+                logger.warning("Capture failed for %s: %s", res, e)
+        return saved
+
+    results: Dict[str, str] = {}
+    if groups:
+        with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+            for saved in executor.map(capture_group, groups.values()):
+                results.update(saved)
+    return results
 
 
 def main() -> None:
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
     # Auto-detect connected oscilloscope or fall back to manual address
     resource_name = detect_oscilloscope()
     if resource_name is None:
-        print("ERROR: No oscilloscope found. Check USB connection.")
+        logger.error("ERROR: No oscilloscope found. Check USB connection.")
         return
 
     # Capture using configuration constants declared at the top of the file
@@ -302,8 +724,10 @@ def main() -> None:
 
     # Example overrides:
     # capture_screenshot_display(resource_name, autoscale=False, timebase_scale=0.002)
+    # capture_screenshot_display(resource_name, configure_display=False)  # screen as it is
     # set_autoscale_state(resource_name, enabled=True)
     # set_timebase_scale(resource_name, seconds_per_division=0.01)
+    # capture_many(list_resources(), autoscale=False)  # all instruments at once
 
 
 if __name__ == '__main__':